@@ -0,0 +1,176 @@
+from multiprocessing import shared_memory
+from collections import OrderedDict
+import multiprocessing as mp
+import pandas as pd
+import numpy as np
+import time
+import os
+
+# native thread pools a worker could start, capped to threads_per_worker
+THREAD_ENV = ['OMP_NUM_THREADS', 'OPENBLAS_NUM_THREADS', 'MKL_NUM_THREADS']
+
+_worker = {}  # per worker process, filled by _init_worker()
+
+
+class Evaluation:
+
+    '''
+    Cross validates a model and fits it on a holdout split, like modeling.ipynb,
+    in a single pool of processes.
+    The encoded dataset is put in shared memory once and every worker reads from it,
+    each worker is capped to threads_per_worker threads so the pool doesn't oversubscribe the cores.
+
+    Parameters:
+        model (sklearn estimator): Model to evaluate, cloned for every task (like XGBClassifier(...)).
+        n_splits (int): Number of StratifiedKFold folds.
+        test_size (float): Share of the holdout split, None to only cross validate.
+        n_workers (int): Number of processes, defaults to one per task within the number of cores.
+        threads_per_worker (int): Threads per model, defaults to the cores shared between the workers.
+        seed (int): Seed for the holdout split.
+
+    Returns:
+        report: An ordered dictionary with per-fold accuracy/timings, feature importances, totals,
+                and the model fitted on the holdout split.
+    '''
+
+    def __init__(self, model, n_splits=10, test_size=0.10, n_workers=None,
+                 threads_per_worker=None, seed=0):
+        self.model = model
+        self.n_splits = n_splits
+        self.test_size = test_size
+        self.n_workers = n_workers
+        self.threads_per_worker = threads_per_worker
+        self.seed = seed
+
+    def run(self, X, y):
+        start = time.perf_counter()
+        tasks = self._get_tasks(X, y)
+
+        n_cores = os.cpu_count() or 1
+        n_workers = self.n_workers or max(1, min(len(tasks), n_cores))
+        threads = self.threads_per_worker or max(1, n_cores // n_workers)
+
+        # xgboost works in float32, so the shared copy is float32 as well
+        X_shm, X_shared = self._share(np.asarray(X, dtype=np.float32))
+        y_shm, y_shared = self._share(np.asarray(y, dtype=np.float64))
+        try:
+            with _thread_env(threads):  # spawned workers start with the capped environment
+                pool = mp.get_context('spawn').Pool(
+                    n_workers,
+                    initializer=_init_worker,
+                    initargs=(X_shm.name, X_shared.shape, y_shm.name, y_shared.shape,
+                              self.model, threads)
+                )
+            with pool:
+                results = list(pool.imap_unordered(_fit_task, tasks))
+        finally:
+            for shm in (X_shm, y_shm):
+                shm.close()
+                shm.unlink()
+
+        return self._get_report(results, list(getattr(X, 'columns', range(X_shared.shape[1]))),
+                                n_workers, threads, time.perf_counter() - start)
+
+    def _get_tasks(self, X, y):  # same folds/split as the notebook's cross_val_score/train_test_split
+        from sklearn.model_selection import StratifiedKFold, train_test_split
+
+        tasks = []
+        for fold, (train_idx, test_idx) in enumerate(
+                StratifiedKFold(n_splits=self.n_splits).split(np.zeros(len(y)), y)):
+            tasks.append((f'fold{fold+1}', train_idx, test_idx))
+
+        if self.test_size:
+            train_idx, test_idx = train_test_split(np.arange(len(y)), test_size=self.test_size,
+                                                   random_state=self.seed)
+            tasks.insert(0, ('holdout', train_idx, test_idx))
+        return tasks
+
+    def _share(self, array):
+        shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        shared = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+        shared[:] = array
+        return shm, shared
+
+    def _get_report(self, results, columns, n_workers, threads, wall_seconds):
+        holdout = [result for result in results if result['task'] == 'holdout']
+        folds = [result for result in results if result['task'] != 'holdout']
+        folds.sort(key=lambda result: int(result['task'][4:]))
+
+        importances = None
+        if folds[0]['feature_importances'] is not None:
+            importances = pd.DataFrame(
+                {result['task']: result['feature_importances'] for result in folds + holdout},
+                index=columns
+            )
+            importances['mean'] = importances[[result['task'] for result in folds]].mean(axis=1)
+            importances = importances.sort_values(by='mean', ascending=False)
+
+        report = OrderedDict()
+        report['folds'] = pd.DataFrame(
+            [{k: v for k, v in result.items() if k not in ('feature_importances', 'model')}
+             for result in folds]
+        ).set_index('task')
+        report['accuracy'] = float(report['folds']['accuracy'].mean())
+        report['holdout_accuracy'] = holdout[0]['accuracy'] if holdout else None
+        report['feature_importances'] = importances
+        report['model'] = holdout[0]['model'] if holdout else None
+        report['n_workers'] = n_workers
+        report['threads_per_worker'] = threads
+        report['wall_seconds'] = wall_seconds
+        return report
+
+
+class _thread_env:  # sets THREAD_ENV while the workers are spawned, then restores it
+    def __init__(self, threads):
+        self.threads = threads
+
+    def __enter__(self):
+        self.previous = {var: os.environ.get(var) for var in THREAD_ENV}
+        os.environ.update({var: str(self.threads) for var in THREAD_ENV})
+
+    def __exit__(self, *exc):
+        for var, value in self.previous.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+
+
+def _init_worker(X_name, X_shape, y_name, y_shape, model, threads):
+    X_shm = shared_memory.SharedMemory(name=X_name)
+    y_shm = shared_memory.SharedMemory(name=y_name)
+    _worker['shm'] = (X_shm, y_shm)  # keeps the buffers alive
+    _worker['X'] = np.ndarray(X_shape, dtype=np.float32, buffer=X_shm.buf)
+    _worker['y'] = np.ndarray(y_shape, dtype=np.float64, buffer=y_shm.buf)
+    _worker['model'] = model
+    _worker['threads'] = threads
+
+
+def _fit_task(task):
+    from sklearn.base import clone
+
+    name, train_idx, test_idx = task
+    X, y = _worker['X'], _worker['y']
+    model = clone(_worker['model'])
+    if 'n_jobs' in model.get_params():
+        model.set_params(n_jobs=_worker['threads'])
+
+    start = time.perf_counter()
+    model.fit(X[train_idx], y[train_idx])
+    fit_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    predictions = model.predict(X[test_idx])
+    predict_seconds = time.perf_counter() - start
+
+    return OrderedDict(
+        task=name,
+        accuracy=float(np.mean(predictions == y[test_idx])),
+        fit_seconds=fit_seconds,
+        predict_seconds=predict_seconds,
+        train_rows=len(train_idx),
+        test_rows=len(test_idx),
+        pid=os.getpid(),
+        feature_importances=getattr(model, 'feature_importances_', None),
+        model=model if name == 'holdout' else None
+    )
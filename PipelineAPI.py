@@ -1,10 +1,7 @@
 from collections import OrderedDict
 from multiprocessing import Pool
 from operator import itemgetter
-from bs4 import BeautifulSoup
 import numpy as np
-import requests
-import roleml
 import json
 
 class PipelineAPI:
@@ -98,6 +95,7 @@ class PipelineAPI:
         return None, None
 
     def _get_roles(self, match_raw, timeline_raw):  # predict the role using api data
+        import roleml
         return roleml.predict(match_raw, timeline_raw)
 
     def _get_timeline_data(self, timeline_raw):  # pull timeline data and sort it
@@ -252,7 +250,10 @@ class PipelineAPI:
         return (summoners_stats)
 
     @staticmethod
-    def _scrape(url):
+    def _scrape(url):  # scraping dependencies are only imported in the workers
+        from bs4 import BeautifulSoup
+        import requests
+
         headers = {'User-Agent': 'Mozilla/5.0'}
         response = requests.get(
             url=url,
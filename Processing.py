@@ -1,25 +1,19 @@
-from sklearn.preprocessing import OrdinalEncoder
-from riotwatcher import LolWatcher, ApiError
 from collections import OrderedDict
-from multiprocessing import Pool
-from operator import itemgetter
-from bs4 import BeautifulSoup
-from pprint import pprint
-from tqdm import tqdm
 import pandas as pd
-import numpy as np
-import requests
-import roleml
 import json
 import os
 
-from settings import API_KEY, REGION
+from Features import Features
 
-class Processing:
-    def __init__(self):
-        self.champion_mapping = self._get_champion_mapping()
+class Processing(Features):
+    def __init__(self, champion_mapping=None):
+        if champion_mapping is None:
+            champion_mapping = self._get_champion_mapping()
+        super().__init__(champion_mapping)
 
     def run(self):
+        from tqdm import tqdm
+
         df_list = []
         df_viz = []
         n_matches = 20000
@@ -32,163 +26,18 @@ class Processing:
                 with open(os.path.join(path+filename), 'r') as f:
                     match_data = OrderedDict(json.load(f))
                     try:
-                        red_team, tmp_red = self._process_team(
-                            [list(match_data.items())[:5][i][1] for i in range(5)]
-                        )
-                        blue_team, tmp_blue = self._process_team(
-                            [list(match_data.items())[5:][i][1] for i in range(5)]
-                        )
-                        df_list.append(self._evaluate_teams(red_team, blue_team, 
-                                                            tmp_red, tmp_blue))
-                        df_viz.extend([red_team, blue_team])
+                        eval_team, teams = self._process_match(match_data)
+                        df_list.append(eval_team)
+                        df_viz.extend(teams)
                     except (KeyError, ValueError) as e:
                         pass
         return pd.concat(df_list).dropna().reset_index(drop=True),\
                pd.concat(df_viz).dropna().reset_index(drop=True) 
 
-    def _process_team(self, team):
-        team = pd.DataFrame(team)
-        
-        # sort by role, and fix index
-        team = team.sort_values(by='role')
-        team.index = range(1, len(team.index) + 1)
-        
-        # calculating winrate
-        team['winRate'] = team['wins']/(team['wins']+team['losses'])*100
-        
-        # fill null values
-        team['accountLevel'].fillna(team['accountLevel'].mean(), inplace=True)
-        team['rankDivision'].fillna(team['rankDivision'].mode()[0], inplace=True)
-        team['wins'].fillna(team['wins'].mean(), inplace=True)
-        team['losses'].fillna(team['losses'].mean(), inplace=True)
-        team['winRate'].fillna(team['winRate'].mean(), inplace=True)
-        team['accountLevel'].fillna(team['accountLevel'].mean(), inplace=True)
-        team['mainRole'].fillna(team['role'] if np.random.choice(2, 1, p=[0.4, 0.6])[0] == 1\
-                                 else 'nope', inplace=True) # using outcome of calculated
-                                                            # distribution of players playing
-                                                            # their main roles.
-        team['altRole'].fillna(team['role'] if np.random.choice(2, 1, p=[0.25, 0.75])[0] == 1\
-                                 else 'nope', inplace=True) # using outcome of calculated
-                                                            # distribution of players playing
-                                                            # their alt roles.
-        team['mainChampMasteryLvl'].fillna(team['mainChampMasteryLvl'].mean(), inplace=True)
-        team['mainChampMasteryPts'].fillna(team['mainChampMasteryPts'].mean(), inplace=True)
-
-        # Encode ranks/champions
-        team = self._encode(team)
-        
-        # jungle cs to normal cs
-        team['minionsKilled'] = team['minionsKilled'] + team['jungleMinionsKilled']
-        team = team.drop('jungleMinionsKilled', axis=1)
-        
-        #sum/average everything into one row and feature selection
-        team_sum = pd.DataFrame({
-            'sumAccountLevel'       : [np.sum(team['accountLevel'])],
-            'sumGamesPlayed'        : [np.sum(team['wins']+team['losses'])],
-            'sumRanks'              : [np.sum(team['rankDivision'])],
-            'averageWinrate'        : [np.mean(team['winRate'])],
-            'sumPlayingMainRole'    : [np.sum(np.where(team['role']==team['mainRole'], 1, 0))],
-            'sumPlayingAltRole'     : [np.sum(np.where(team['role']==team['altRole'], 1, 0))],
-            'sumPlayingMain'        : [np.sum(np.where(team['champion']==team['mainChamp'], 1, 0))],
-            'sumMainMasteryLvl'     : [np.sum(team['mainChampMasteryLvl'])],
-            'sumMainMasteryPts'     : [np.sum(team['mainChampMasteryPts'])],
-            'sumKills'              : [np.sum(team['kills'])],
-            'sumAssists'            : [np.sum(team['assists'])],
-            'sumDeaths'             : [np.sum(team['deaths'])],
-            'sumXp'                 : [np.sum(team['xp'])],
-            'sumGold'               : [np.sum(team['totalGold'])],
-            'sumMinionsKilled'      : [np.sum(team['minionsKilled'])],
-            'sumWardsPlaced'        : [np.sum(team['wardPlaced'])],
-            'sumWardsDestroyed'     : [np.sum(team['wardDestroyed'])],
-            'sumMonstersKilled'     : [np.sum(team['dragonKilled']+team['riftHeraldKilled'])],
-            'sumBuildingsDestroyed' : [np.sum(team['towerDestroyed']+team['inhibitorDestroyed'])],
-            'win'                   : [np.mean(team['win'])]
-            }
-        )
-        for idx, row in team.iterrows():
-            team_sum[f"{row['role']}Champ"] = row['champion']
-        return team_sum, team
-    
-    def _encode(self, team):
-        categories=[
-            'Unranked',
-            'Iron IV', 'Iron III', 'Iron II', 'Iron I',
-            'Bronze IV', 'Bronze III', 'Bronze II', 'Bronze I',
-            'Silver IV', 'Silver III', 'Silver II', 'Silver I',
-            'Gold IV', 'Gold III', 'Gold II', 'Gold I',
-            'Platinum IV', 'Platinum III', 'Platinum II', 'Platinum I',
-            'Diamond IV', 'Diamond III', 'Diamond II', 'Diamond I',
-            'Master',
-            'GrandMaster',
-            'Challenger'
-        ]
-        rank_encoder = OrdinalEncoder(categories=[categories])
-        team['rankDivision'] = rank_encoder.fit_transform(team[['rankDivision']])
-        
-        team['champion'] = team['championId'].astype(str).map(self.champion_mapping)
-
-        team.loc[team.mainChamp == 'Wukong', 'mainChamp'] = 'MonkeyKing'
-        team.loc[team.mainChamp == 'Nunu &amp; Willump', 'mainChamp'] = 'nunu'
-        team['champion'] = team['champion'].str.replace(' ', '')\
-                                           .str.replace("'",'')\
-                                           .str.replace('.','')\
-                                           .str.lower()
-        team['mainChamp'] = team['mainChamp'].str.replace(' ','')\
-                                             .str.replace("'",'')\
-                                             .str.replace('.','')\
-                                             .str.lower()
-
-        # have to fill null here as I need the championId mapped
-        team['mainChamp'].fillna(team['champion']
-                                if np.random.choice(2, 1, p=[0.7, 0.3])[0] == 1 \
-                                else 'rumble', inplace=True) # fill using distribution of playingMain
-                                                             # rumble lowest pickrate (lazy solution)
-                                                            # distribution = 0.31/0.69, rumble (0.8) 
-        champ_encoder = OrdinalEncoder(categories=[[champ for champ in self.champion_mapping.values()]])
-        team['champion'] = champ_encoder.fit_transform(team[['champion']])
-        team['mainChamp'] = champ_encoder.fit_transform(team[['mainChamp']])
-        return team
-    
-    def _evaluate_teams(self, team, enemy_team, tmp_team, tmp_enemy):
-        eval_team = pd.DataFrame({
-            'accountLevel'       : (team['sumAccountLevel']-enemy_team['sumAccountLevel']).values,
-            'ranks'              : (team['sumRanks']-enemy_team['sumRanks']).values,
-            'gamesPlayed'        : (team['sumGamesPlayed']-enemy_team['sumGamesPlayed']).values,
-            'winrate'            : (team['averageWinrate']-enemy_team['averageWinrate']).values,
-            'playingMainRoles'   : (team['sumPlayingMainRole']-enemy_team['sumPlayingMainRole']).values,
-            'playingAltRoles'    : (team['sumPlayingAltRole']-enemy_team['sumPlayingAltRole']).values,
-            'playingMains'       : (team['sumPlayingMain']-enemy_team['sumPlayingMain']).values,
-            'mainMasteryLvl'     : (team['sumMainMasteryLvl']-enemy_team['sumMainMasteryLvl']).values,
-            'mainMasteryPts'     : (team['sumMainMasteryPts']-enemy_team['sumMainMasteryPts']).values,
-            'kills'              : (team['sumKills']-enemy_team['sumKills']).values, 
-            'assists'            : (team['sumAssists']-enemy_team['sumAssists']).values, 
-            'deaths'             : (team['sumDeaths']-enemy_team['sumDeaths']).values,
-            'xp'                 : (team['sumXp']-enemy_team['sumXp']).values, 
-            'gold'               : (team['sumGold']-enemy_team['sumGold']).values, 
-            'minionsKilled'      : (team['sumMinionsKilled']-enemy_team['sumMinionsKilled']).values,
-            'wardsPlaced'        : (team['sumWardsPlaced']-enemy_team['sumWardsPlaced']).values,
-            'wardsDestroyed'     : (team['sumWardsDestroyed']-enemy_team['sumWardsDestroyed']).values,
-            'monstersKilled'     : (team['sumMonstersKilled']-enemy_team['sumMonstersKilled']).values,
-            'buildingsDestroyed' : (team['sumBuildingsDestroyed']-enemy_team['sumBuildingsDestroyed']).values,
-            'winningLane'        : (len(np.where((tmp_team['totalGold'] > tmp_enemy['totalGold']) & 
-                                                 (tmp_team['xp'] > tmp_enemy['xp']))[0])),
-
-            'suppChamp'          : team['suppChamp'],
-            'botChamp'           : team['botChamp'],
-            'midChamp'           : team['midChamp'],
-            'jungleChamp'        : team['jungleChamp'],
-            'topChamp'           : team['topChamp'],
-            'enemySuppChamp'     : enemy_team['suppChamp'],
-            'enemyBotChamp'      : enemy_team['botChamp'],
-            'enemyMidChamp'      : enemy_team['midChamp'],
-            'enemyJungleChamp'   : enemy_team['jungleChamp'],
-            'enemyTopChamp'      : enemy_team['topChamp'],
-            'win'                : team['win']
-            }
-        )
-        return eval_team
+    def _get_champion_mapping(self):  # riot's api and the key are only needed here
+        from riotwatcher import LolWatcher
+        from settings import API_KEY, REGION
 
-    def _get_champion_mapping(self):
         watcher = LolWatcher(API_KEY)
         versions = watcher.data_dragon.versions_for_region(REGION.lower())
         champions_version = versions['n']['champion']
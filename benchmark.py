@@ -0,0 +1,554 @@
+from collections import OrderedDict
+import argparse
+import subprocess
+import resource
+import hashlib
+import json
+import time
+import sys
+import os
+
+import pandas as pd
+import numpy as np
+
+from Evaluation import Evaluation
+from Features import Features
+
+BASELINE_PATH = 'benchmark_baseline.json'
+
+# network/scrape/ML dependencies, must only be imported on first use
+LAZY_MODULES = ['sklearn', 'riotwatcher', 'bs4', 'requests', 'roleml', 'tqdm', 'settings',
+                'xgboost', 'category_encoders']
+# module: (seconds, peak RSS in MB), about 2x what was measured after the split
+IMPORT_BUDGET = OrderedDict([
+    ('Features', (0.7, 130)),
+    ('Processing', (0.7, 130)),
+    ('PipelineAPI', (0.3, 70)),
+    ('Evaluation', (0.7, 130))
+])
+_IMPORT_PROBE = '''
+import resource, json, time, sys
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+modules = sorted(set(m.split('.')[0] for m in sys.modules))
+try:  # ru_maxrss is inherited from the parent on linux, VmHWM isn't
+    with open('/proc/self/status') as f:
+        peak = [int(line.split()[1]) for line in f if line.startswith('VmHWM')][0]
+except OSError:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps([seconds, peak, modules]))
+'''
+
+ROLES = ['top', 'jungle', 'mid', 'bot', 'supp']
+RANKS = [
+    'Iron IV', 'Iron III', 'Iron II', 'Iron I',
+    'Bronze IV', 'Bronze III', 'Bronze II', 'Bronze I',
+    'Silver IV', 'Silver III', 'Silver II', 'Silver I',
+    'Gold IV', 'Gold III', 'Gold II', 'Gold I',
+    'Platinum IV', 'Platinum III', 'Platinum II', 'Platinum I',
+    'Diamond IV', 'Diamond III', 'Diamond II', 'Diamond I',
+    'Master',
+    'GrandMaster',
+    'Challenger'
+]
+
+# (key, data dragon id, name as displayed on leagueofgraphs)
+CHAMPIONS = [
+    (1, 'Annie', 'Annie'), (2, 'Olaf', 'Olaf'), (3, 'Galio', 'Galio'),
+    (4, 'TwistedFate', 'Twisted Fate'), (5, 'XinZhao', 'Xin Zhao'), (6, 'Urgot', 'Urgot'),
+    (7, 'Leblanc', 'LeBlanc'), (8, 'Vladimir', 'Vladimir'), (9, 'Fiddlesticks', 'Fiddlesticks'),
+    (10, 'Kayle', 'Kayle'), (11, 'MasterYi', 'Master Yi'), (12, 'Alistar', 'Alistar'),
+    (13, 'Ryze', 'Ryze'), (14, 'Sion', 'Sion'), (15, 'Sivir', 'Sivir'),
+    (16, 'Soraka', 'Soraka'), (17, 'Teemo', 'Teemo'), (18, 'Tristana', 'Tristana'),
+    (19, 'Warwick', 'Warwick'), (20, 'Nunu', 'Nunu &amp; Willump'), (21, 'MissFortune', 'Miss Fortune'),
+    (22, 'Ashe', 'Ashe'), (23, 'Tryndamere', 'Tryndamere'), (24, 'Jax', 'Jax'),
+    (25, 'Morgana', 'Morgana'), (26, 'Zilean', 'Zilean'), (27, 'Singed', 'Singed'),
+    (28, 'Evelynn', 'Evelynn'), (29, 'Twitch', 'Twitch'), (30, 'Karthus', 'Karthus'),
+    (31, 'Chogath', "Cho'Gath"), (32, 'Amumu', 'Amumu'), (33, 'Rammus', 'Rammus'),
+    (34, 'Anivia', 'Anivia'), (35, 'Shaco', 'Shaco'), (36, 'DrMundo', 'Dr. Mundo'),
+    (37, 'Sona', 'Sona'), (38, 'Kassadin', 'Kassadin'), (39, 'Irelia', 'Irelia'),
+    (40, 'Janna', 'Janna'), (41, 'Gangplank', 'Gangplank'), (42, 'Corki', 'Corki'),
+    (43, 'Karma', 'Karma'), (44, 'Taric', 'Taric'), (45, 'Veigar', 'Veigar'),
+    (48, 'Trundle', 'Trundle'), (50, 'Swain', 'Swain'), (51, 'Caitlyn', 'Caitlyn'),
+    (53, 'Blitzcrank', 'Blitzcrank'), (54, 'Malphite', 'Malphite'), (55, 'Katarina', 'Katarina'),
+    (56, 'Nocturne', 'Nocturne'), (57, 'Maokai', 'Maokai'), (58, 'Renekton', 'Renekton'),
+    (59, 'JarvanIV', 'Jarvan IV'), (61, 'Orianna', 'Orianna'), (62, 'MonkeyKing', 'Wukong'),
+    (63, 'Brand', 'Brand'), (64, 'LeeSin', 'Lee Sin'), (67, 'Vayne', 'Vayne'),
+    (68, 'Rumble', 'Rumble'), (69, 'Cassiopeia', 'Cassiopeia'), (72, 'Skarner', 'Skarner'),
+    (74, 'Heimerdinger', 'Heimerdinger'), (75, 'Nasus', 'Nasus'), (76, 'Nidalee', 'Nidalee'),
+    (77, 'Udyr', 'Udyr'), (78, 'Poppy', 'Poppy'), (79, 'Gragas', 'Gragas'),
+    (80, 'Pantheon', 'Pantheon'), (81, 'Ezreal', 'Ezreal'), (82, 'Mordekaiser', 'Mordekaiser'),
+    (83, 'Yorick', 'Yorick'), (84, 'Akali', 'Akali'), (85, 'Kennen', 'Kennen'),
+    (86, 'Garen', 'Garen'), (89, 'Leona', 'Leona'), (90, 'Malzahar', 'Malzahar'),
+    (91, 'Talon', 'Talon'), (92, 'Riven', 'Riven'), (96, 'KogMaw', "Kog'Maw"),
+    (98, 'Shen', 'Shen'), (99, 'Lux', 'Lux'), (101, 'Xerath', 'Xerath'),
+    (102, 'Shyvana', 'Shyvana'), (103, 'Ahri', 'Ahri'), (104, 'Graves', 'Graves'),
+    (105, 'Fizz', 'Fizz'), (106, 'Volibear', 'Volibear'), (107, 'Rengar', 'Rengar'),
+    (110, 'Varus', 'Varus'), (111, 'Nautilus', 'Nautilus'), (112, 'Viktor', 'Viktor'),
+    (113, 'Sejuani', 'Sejuani'), (114, 'Fiora', 'Fiora'), (115, 'Ziggs', 'Ziggs'),
+    (117, 'Lulu', 'Lulu'), (119, 'Draven', 'Draven'), (120, 'Hecarim', 'Hecarim'),
+    (121, 'Khazix', "Kha'Zix"), (122, 'Darius', 'Darius'), (126, 'Jayce', 'Jayce'),
+    (127, 'Lissandra', 'Lissandra'), (131, 'Diana', 'Diana'), (133, 'Quinn', 'Quinn'),
+    (134, 'Syndra', 'Syndra'), (136, 'AurelionSol', 'Aurelion Sol'), (141, 'Kayn', 'Kayn'),
+    (142, 'Zoe', 'Zoe'), (143, 'Zyra', 'Zyra'), (145, 'Kaisa', "Kai'Sa"),
+    (150, 'Gnar', 'Gnar'), (154, 'Zac', 'Zac'), (157, 'Yasuo', 'Yasuo'),
+    (161, 'Velkoz', "Vel'Koz"), (163, 'Taliyah', 'Taliyah'), (164, 'Camille', 'Camille'),
+    (201, 'Braum', 'Braum'), (202, 'Jhin', 'Jhin'), (203, 'Kindred', 'Kindred'),
+    (222, 'Jinx', 'Jinx'), (223, 'TahmKench', 'Tahm Kench'), (235, 'Senna', 'Senna'),
+    (236, 'Lucian', 'Lucian'), (238, 'Zed', 'Zed'), (240, 'Kled', 'Kled'),
+    (245, 'Ekko', 'Ekko'), (246, 'Qiyana', 'Qiyana'), (254, 'Vi', 'Vi'),
+    (266, 'Aatrox', 'Aatrox'), (267, 'Nami', 'Nami'), (268, 'Azir', 'Azir'),
+    (350, 'Yuumi', 'Yuumi'), (360, 'Samira', 'Samira'), (412, 'Thresh', 'Thresh'),
+    (420, 'Illaoi', 'Illaoi'), (421, 'RekSai', "Rek'Sai"), (427, 'Ivern', 'Ivern'),
+    (429, 'Kalista', 'Kalista'), (432, 'Bard', 'Bard'), (497, 'Rakan', 'Rakan'),
+    (498, 'Xayah', 'Xayah'), (516, 'Ornn', 'Ornn'), (517, 'Sylas', 'Sylas'),
+    (518, 'Neeko', 'Neeko'), (523, 'Aphelios', 'Aphelios'), (555, 'Pyke', 'Pyke'),
+    (777, 'Yone', 'Yone'), (875, 'Sett', 'Sett'), (876, 'Lillia', 'Lillia')
+]
+
+# same encoding/scaling/model as modeling.ipynb
+TO_ENCODE = ['suppChamp', 'botChamp', 'midChamp', 'jungleChamp', 'topChamp',
+             'enemySuppChamp', 'enemyBotChamp', 'enemyMidChamp', 'enemyJungleChamp', 'enemyTopChamp']
+TO_SCALE = ['accountLevel', 'ranks', 'gamesPlayed', 'winrate', 'playingMainRoles', 'playingAltRoles',
+            'playingMains', 'mainMasteryLvl', 'mainMasteryPts', 'winningLane', 'kills', 'assists',
+            'deaths', 'xp', 'gold', 'minionsKilled', 'wardsPlaced', 'wardsDestroyed',
+            'monstersKilled', 'buildingsDestroyed']
+TO_DROP = ['playingAltRoles', 'mainMasteryPts', 'winningLane']
+XGB_PARAMS = {
+    'objective': 'binary:logistic',
+    'n_estimators': 1200,
+    'min_child_weight': 2,
+    'max_depth': 3,
+    'learning_rate': 0.05,
+    'gamma': 0.0,
+    'colsample_bytree': 0.8999999999999999
+}
+
+
+class MatchGenerator:
+
+    '''
+    Generates synthetic matches in the same layout as PipelineAPI's JSON output (Player1 to Player10).
+    The generation is seeded, so the same parameters always yield the same matches.
+
+    Parameters:
+        seed (int): Seed of the generator's random state.
+        null_rate (float): Probability for a player's scraped stats to be missing.
+        unranked_rate (float): Probability for a player to be unranked.
+        platform (str): Value of the platformId field.
+
+    Returns:
+        packed_data: An ordered dictionary per match, see run().
+    '''
+
+    def __init__(self, seed=0, null_rate=0.03, unranked_rate=0.05, platform='EUW1'):
+        self.rng = np.random.RandomState(seed)
+        self.null_rate = null_rate
+        self.unranked_rate = unranked_rate
+        self.platform = platform
+
+    @property
+    def champion_mapping(self):  # same format as Processing._get_champion_mapping()
+        return {f'{key}': champ.lower() for key, champ, _ in CHAMPIONS}
+
+    def run(self, n_matches):  # yields one match at a time, no matter the scale
+        for _ in range(n_matches):
+            yield self._match()
+
+    def write(self, n_matches, path):  # one file per match, like data/output_json/<server>/
+        os.makedirs(path, exist_ok=True)
+        width = len(str(n_matches))
+        for idx, match in enumerate(self.run(n_matches)):
+            with open(os.path.join(path, f'synthetic{idx:0{width}d}.json'), 'w', encoding='utf8') as f:
+                f.write(json.dumps(match, indent=4, ensure_ascii=False)+'\n')
+
+    def _match(self):
+        strength = self.rng.normal(0, 1, 2)  # hidden team strength, drives stats and outcome
+        blue_win = int(self.rng.rand() < 1/(1+np.exp(-1.5*(strength[0]-strength[1]))))
+        tier = self.rng.randint(0, len(RANKS)-3)  # matchmaking rank around which players are
+        champions = self.rng.choice(len(CHAMPIONS), 10, replace=False)
+
+        packed_data = OrderedDict()
+        for team in range(2):
+            roles = self.rng.permutation(ROLES)
+            for i in range(5):
+                participant_id = team*5 + i + 1
+                packed_data[f'Player{participant_id}'] = self._player(
+                    participant_id=participant_id,
+                    team_id=100 if team == 0 else 200,
+                    role=str(roles[i]),
+                    champion=CHAMPIONS[champions[participant_id-1]],
+                    tier=tier,
+                    strength=strength[team],
+                    win=blue_win if team == 0 else 1-blue_win
+                )
+        return packed_data
+
+    def _player(self, participant_id, team_id, role, champion, tier, strength, win):
+        rng = self.rng
+        player = OrderedDict()
+        player['summonerName'] = f'Summoner{rng.randint(10**9)}'
+        player['platformId'] = self.platform
+        player.update(self._scraped_stats(role, champion, tier, strength))
+        player['participantId'] = participant_id
+        player['teamId'] = team_id
+        player['championId'] = champion[0]
+        player['role'] = role
+
+        # stats at minute 15
+        player['level'] = int(np.clip(rng.normal(9 + 0.3*strength, 1), 5, 13))
+        player['xp'] = int(max(rng.normal(5200 + 300*strength, 800), 1500))
+        player['totalGold'] = int(max(rng.normal(5000 + 350*strength, 700), 1500))
+        if role == 'jungle':
+            player['minionsKilled'] = int(rng.randint(0, 12))
+            player['jungleMinionsKilled'] = int(max(rng.normal(75 + 5*strength, 12), 0))
+        elif role == 'supp':
+            player['minionsKilled'] = int(max(rng.normal(18, 8), 0))
+            player['jungleMinionsKilled'] = 0
+        else:
+            player['minionsKilled'] = int(max(rng.normal(105 + 8*strength, 18), 0))
+            player['jungleMinionsKilled'] = int(rng.poisson(2))
+        player['kills'] = int(rng.poisson(max(1.5 + 0.6*strength, 0.1)))
+        player['assists'] = int(rng.poisson(max(2 + 0.6*strength, 0.1)))
+        player['deaths'] = int(rng.poisson(max(1.5 - 0.6*strength, 0.1)))
+        player['wardPlaced'] = int(rng.poisson(14 if role == 'supp' else 5))
+        player['wardDestroyed'] = int(rng.poisson(1.5 if role == 'supp' else 0.5))
+        player['towerDestroyed'] = int(rng.poisson(max(0.2 + 0.1*strength, 0.01)))
+        player['inhibitorDestroyed'] = 0
+        player['dragonKilled'] = int(rng.poisson(0.8 if role == 'jungle' else 0.05))
+        player['riftHeraldKilled'] = int(rng.poisson(0.4 if role == 'jungle' else 0.02))
+        player['win'] = win
+        return player
+
+    def _scraped_stats(self, role, champion, tier, strength):  # what leagueofgraphs would give
+        rng = self.rng
+        stats = OrderedDict.fromkeys([
+            'accountLevel', 'rankDivision', 'wins', 'losses', 'mainRole',
+            'altRole', 'mainChamp', 'mainChampMasteryLvl', 'mainChampMasteryPts'
+        ])
+        if rng.rand() < self.null_rate:  # scraping failed
+            return stats
+
+        stats['accountLevel'] = int(rng.randint(30, 500))
+        if rng.rand() < self.unranked_rate:
+            stats['rankDivision'] = 'Unranked'
+            stats['wins'], stats['losses'] = 1, 1
+        else:
+            stats['rankDivision'] = RANKS[int(np.clip(tier + rng.randint(-2, 3), 0, len(RANKS)-1))]
+            games = int(rng.randint(20, 500))
+            stats['wins'] = int(rng.binomial(games, np.clip(0.5 + 0.02*strength, 0.3, 0.7)))
+            stats['losses'] = games - stats['wins']
+
+        other_roles = [r for r in ROLES if r != role]
+        stats['mainRole'] = role if rng.rand() < 0.6 else str(rng.choice(other_roles))
+        stats['altRole'] = str(rng.choice([r for r in ROLES if r != stats['mainRole']]))
+        stats['mainChamp'] = champion[2] if rng.rand() < 0.3 \
+                             else CHAMPIONS[rng.randint(len(CHAMPIONS))][2]
+        stats['mainChampMasteryLvl'] = int(rng.randint(1, 8))
+        stats['mainChampMasteryPts'] = int(stats['mainChampMasteryLvl']*rng.randint(1000, 60000))
+        return stats
+
+
+class Benchmark:
+
+    '''
+    Times Processing's stages (through Features) and the modeling pipeline from modeling.ipynb on synthetic matches.
+    Every run also hashes its outputs, so a speedup can be checked for identical results.
+
+    Parameters:
+        n_matches (int): Number of matches to generate and process.
+        seed (int): Seed for the match generator, the imputation and the model.
+        n_estimators (int): Number of trees for the XGBoost model.
+        skip_model (bool): Only benchmark Processing.
+        evaluate (bool): Also time the notebook's 10-fold cross_val_score + holdout fit, against Evaluation.
+
+    Returns:
+        report: An ordered dictionary with timings, rows/sec, peak RSS and golden hashes.
+    '''
+
+    def __init__(self, n_matches=1000, seed=0, n_estimators=XGB_PARAMS['n_estimators'],
+                 skip_model=False, evaluate=False):
+        self.n_matches = n_matches
+        self.seed = seed
+        self.n_estimators = n_estimators
+        self.skip_model = skip_model
+        self.evaluate = evaluate and not skip_model
+        self.stages = OrderedDict()
+
+    @property
+    def scenario(self):
+        scenario = f'matches={self.n_matches},seed={self.seed}'
+        if not self.skip_model:
+            scenario += f',n_estimators={self.n_estimators}'
+        if self.evaluate:
+            scenario += ',evaluate'
+        return scenario
+
+    def run(self):
+        report = OrderedDict(scenario=self.scenario, stages=self.stages,
+                             peak_rss_mb=OrderedDict(), golden=OrderedDict())
+
+        df, df_viz = self._bench_processing(report)
+        report['peak_rss_mb']['processing'] = _peak_rss_mb()
+        report['golden']['df'] = _hash_frame(df)
+        report['golden']['df_viz'] = _hash_frame(df_viz)
+
+        if not self.skip_model:
+            X, y, predictions, accuracy = self._bench_model(df)
+            report['peak_rss_mb']['model'] = _peak_rss_mb()
+            report['golden']['predictions'] = hashlib.sha256(predictions.tobytes()).hexdigest()
+            report['golden']['accuracy'] = round(float(accuracy), 6)
+
+        if self.evaluate:
+            self._bench_evaluation(X, y, report)
+
+        for stats in self.stages.values():
+            stats['rows_per_sec'] = stats['rows']/stats['seconds'] if stats['seconds'] else None
+        return report
+
+    def _bench_processing(self, report):
+        generator = MatchGenerator(seed=self.seed)
+        features = Features(generator.champion_mapping)
+
+        # wrap the instance's methods, _process_team's time includes _encode's
+        features._process_team = self._timed('process_team', features._process_team)
+        features._encode = self._timed('encode', features._encode)
+        features._evaluate_teams = self._timed('evaluate_teams', features._evaluate_teams)
+        parse = self._timed('parse_json', json.loads)
+
+        df_list = []
+        df_viz = []
+        skipped = 0
+        np.random.seed(self.seed)  # Processing imputes some values with np.random
+        for match in generator.run(self.n_matches):
+            text = json.dumps(match, indent=4)  # not timed, stands in for the file on disk
+            match_data = OrderedDict(parse(text))
+            try:
+                eval_team, teams = features._process_match(match_data)
+                df_list.append(eval_team)
+                df_viz.extend(teams)
+            except (KeyError, ValueError) as e:
+                skipped += 1
+        report['skipped_matches'] = skipped
+
+        with self._stage('concat', len(df_list)):
+            df = pd.concat(df_list).dropna().reset_index(drop=True)
+            df_viz = pd.concat(df_viz).dropna().reset_index(drop=True)
+        return df, df_viz
+
+    def _bench_model(self, df):
+        import category_encoders as ce
+        from sklearn.preprocessing import RobustScaler
+        from sklearn.model_selection import train_test_split
+        from xgboost import XGBClassifier
+
+        with self._stage('woe_encode', len(df)):
+            encoder = ce.WOEEncoder(cols=TO_ENCODE)
+            encoder.fit(df[TO_ENCODE], df['win'])
+            encoded_champs = encoder.transform(df[TO_ENCODE])
+
+        with self._stage('robust_scale', len(df)):
+            tmp = pd.concat([df[TO_SCALE], encoded_champs], axis=1)
+            data = RobustScaler().fit_transform(tmp.values)
+            data = pd.DataFrame(data, index=tmp.index, columns=tmp.columns)
+            data.drop(TO_DROP, inplace=True, axis=1)
+            data['win'] = df['win']
+
+        X = data.drop(['win'], axis=1)
+        y = data['win']
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.10,
+                                                            random_state=self.seed)
+        params = dict(XGB_PARAMS, n_estimators=self.n_estimators, random_state=self.seed)
+        model = XGBClassifier(**params)
+
+        with self._stage('fit', len(X_train)):
+            model.fit(X_train, y_train)
+        with self._stage('predict', len(X_test)):
+            predictions = model.predict(X_test)
+        return X, y, predictions, np.mean(predictions == y_test)
+
+    def _bench_evaluation(self, X, y, report):  # notebook's way first, then the same work with Evaluation
+        from sklearn.model_selection import StratifiedKFold, cross_val_score, train_test_split
+        from xgboost import XGBClassifier
+
+        params = dict(XGB_PARAMS, n_estimators=self.n_estimators, random_state=self.seed)
+        with self._stage('cross_val_score', len(X)):
+            scores = cross_val_score(XGBClassifier(**params), X, y, scoring='accuracy',
+                                     cv=StratifiedKFold(n_splits=10), n_jobs=-1)
+            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.10,
+                                                                random_state=self.seed)
+            XGBClassifier(**params).fit(X_train, y_train).predict(X_test)
+
+        with self._stage('evaluation', len(X)):
+            evaluation = Evaluation(XGBClassifier(**params), n_splits=10, test_size=0.10,
+                                    seed=self.seed).run(X, y)
+
+        report['peak_rss_mb']['evaluation'] = _peak_rss_mb()
+        report['golden']['cv_accuracy'] = round(float(np.mean(scores)), 6)
+        report['golden']['evaluation_accuracy'] = round(evaluation['accuracy'], 6)
+
+    def _timed(self, stage, func):  # every call counts as one row
+        def wrapper(*args, **kwargs):
+            with self._stage(stage, 1):
+                return func(*args, **kwargs)
+        return wrapper
+
+    def _stage(self, stage, rows):
+        return _StageTimer(self.stages.setdefault(stage, OrderedDict(seconds=0.0, rows=0)), rows)
+
+
+class _StageTimer:
+    def __init__(self, stats, rows):
+        self.stats = stats
+        self.rows = rows
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.stats['seconds'] += time.perf_counter() - self.start
+        self.stats['rows'] += self.rows
+
+
+def compare(report, baseline, tolerance=0.2, slack=0.05):
+    '''
+    Compares a report to its baseline.
+    A stage fails when it is slower than its baseline by more than `tolerance` (relative)
+    and `slack` seconds, peak RSS fails above `tolerance`, golden hashes must match exactly.
+
+    Returns:
+        failures: A list of messages, empty if the report is within tolerances.
+    '''
+    failures = []
+    for stage, stats in baseline['stages'].items():
+        current = report['stages'].get(stage)
+        if current is None:
+            failures.append(f'{stage}: missing from the report')
+            continue
+        limit = max(stats['seconds']*(1+tolerance), stats['seconds']+slack)
+        if current['seconds'] > limit:
+            failures.append(f"{stage}: {current['seconds']:.3f}s > {limit:.3f}s")
+
+    for group, rss in baseline['peak_rss_mb'].items():
+        current = report['peak_rss_mb'].get(group)
+        if current is not None and current > rss*(1+tolerance):
+            failures.append(f'peak RSS ({group}): {current:.1f}MB > {rss*(1+tolerance):.1f}MB')
+
+    for key, value in baseline['golden'].items():
+        if report['golden'].get(key) != value:
+            failures.append(f"golden output '{key}' changed: {report['golden'].get(key)} != {value}")
+    return failures
+
+
+def check_imports(repeat=3):
+    '''
+    Imports each module of IMPORT_BUDGET in a fresh interpreter, and checks the median import time
+    and peak RSS against the budget, and that none of LAZY_MODULES was imported along.
+
+    Returns:
+        results, failures: Measures per module, and a list of messages, empty if within budget.
+    '''
+    results = OrderedDict()
+    failures = []
+    for module, (budget_seconds, budget_rss) in IMPORT_BUDGET.items():
+        runs = []
+        for _ in range(repeat):
+            output = subprocess.run([sys.executable, '-c', _IMPORT_PROBE.format(module=module)],
+                                    cwd=os.path.dirname(os.path.abspath(__file__)),
+                                    capture_output=True, text=True, check=True).stdout
+            runs.append(json.loads(output))
+        seconds = float(np.median([run[0] for run in runs]))
+        rss = _rss_to_mb(max(run[1] for run in runs))
+        loaded = [m for m in LAZY_MODULES if m in runs[0][2]]
+        results[module] = OrderedDict(seconds=seconds, peak_rss_mb=rss, lazy_loaded=loaded)
+
+        if seconds > budget_seconds:
+            failures.append(f'import {module}: {seconds:.3f}s > {budget_seconds}s')
+        if rss > budget_rss:
+            failures.append(f'import {module}: {rss:.1f}MB > {budget_rss}MB')
+        if loaded:
+            failures.append(f"import {module} also imports {', '.join(loaded)}")
+    return results, failures
+
+
+def _hash_frame(df):  # %.10g so that harmless float noise doesn't change the hash
+    return hashlib.sha256(df.to_csv(float_format='%.10g').encode()).hexdigest()
+
+
+def _peak_rss_mb():
+    return _rss_to_mb(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+
+
+def _rss_to_mb(peak):  # bytes on macOS, KB on linux
+    return peak/1024**2 if sys.platform == 'darwin' else peak/1024
+
+
+def _print_report(report):
+    print(f"scenario: {report['scenario']} ({report.get('skipped_matches', 0)} matches skipped)")
+    print(f"{'stage':<16}{'seconds':>12}{'rows':>12}{'rows/sec':>14}")
+    for stage, stats in report['stages'].items():
+        rate = f"{stats['rows_per_sec']:.1f}" if stats['rows_per_sec'] else '-'
+        print(f"{stage:<16}{stats['seconds']:>12.3f}{stats['rows']:>12}{rate:>14}")
+    for group, rss in report['peak_rss_mb'].items():
+        print(f'peak RSS after {group}: {rss:.1f}MB')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark Processing and the model on synthetic matches.')
+    parser.add_argument('--matches', type=int, default=1000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--n-estimators', type=int, default=XGB_PARAMS['n_estimators'])
+    parser.add_argument('--skip-model', action='store_true')
+    parser.add_argument('--evaluate', action='store_true',
+                        help="also compare the notebook's cross validation to Evaluation")
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--baseline', default=BASELINE_PATH)
+    parser.add_argument('--save', action='store_true', help='store this run as the scenario baseline')
+    parser.add_argument('--write-json', metavar='DIR',
+                        help='only write the synthetic matches to DIR, one JSON per match')
+    parser.add_argument('--check-imports', action='store_true',
+                        help='only check the import time/RSS budget of the modules')
+    args = parser.parse_args()
+
+    if args.check_imports:
+        results, failures = check_imports()
+        for module, result in results.items():
+            print(f"import {module:<12}{result['seconds']:>8.3f}s{result['peak_rss_mb']:>8.1f}MB")
+        for failure in failures:
+            print('FAIL', failure)
+        return 1 if failures else 0
+
+    if args.write_json:
+        MatchGenerator(seed=args.seed).write(args.matches, args.write_json)
+        return 0
+
+    report = Benchmark(n_matches=args.matches, seed=args.seed, n_estimators=args.n_estimators,
+                       skip_model=args.skip_model, evaluate=args.evaluate).run()
+    _print_report(report)
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            baselines = json.load(f)
+
+    if args.save:
+        baselines[report['scenario']] = report
+        with open(args.baseline, 'w') as f:
+            f.write(json.dumps(baselines, indent=4)+'\n')
+        print(f"baseline saved for {report['scenario']}")
+        return 0
+
+    if report['scenario'] not in baselines:
+        print(f"no baseline for {report['scenario']}, run with --save to store one")
+        return 0
+
+    failures = compare(report, baselines[report['scenario']], tolerance=args.tolerance)
+    for failure in failures:
+        print('FAIL', failure)
+    if not failures:
+        print('OK, within tolerances of the baseline')
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())